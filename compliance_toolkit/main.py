@@ -4,32 +4,60 @@ import argparse
 import json
 import os
 import sys
-from datetime import datetime
-from zipfile import ZipFile
+import time
+from zipfile import ZIP_DEFLATED, ZipFile
 
-from .utils import load_checklists, audit_repo, generate_markdown_report
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
 
+from .utils import _audit_repo, _load_checklists, generate_markdown_report, load_checklists
 
-def cmd_audit(args):
+_CHECKLIST_DIR = os.path.join(os.path.dirname(__file__), 'checklists')
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _dump(obj, path):
+    with open(path, 'wb') as f:
+        f.write(_dumps(obj))
+
+
+def _print_json(obj):
+    # write bytes straight through: no decode/re-encode, and no
+    # UnicodeEncodeError on a non-UTF-8 console
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_dumps(obj) + b'\n')
+
+
+def _audit(args):
     repo = args.repo or os.getcwd()
-    checklist_dir = os.path.join(os.path.dirname(__file__), 'checklists')
-    checks = load_checklists(checklist_dir)
-    results = audit_repo(repo, checks)
+    checks, keyword_sets = _load_checklists(_CHECKLIST_DIR)
+    return _audit_repo(repo, checks, keyword_sets)
+
+
+def _utc_timestamp() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+def cmd_audit(args):
+    results = _audit(args)
     out = args.out
     if out:
-        with open(out, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+        _dump(results, out)
         print(f'Wrote audit JSON to {out}')
     else:
-        print(json.dumps(results, indent=2))
+        _print_json(results)
 
 
 def cmd_report(args):
-    repo = args.repo or os.getcwd()
-    checklist_dir = os.path.join(os.path.dirname(__file__), 'checklists')
-    checks = load_checklists(checklist_dir)
-    results = audit_repo(repo, checks)
-    md = generate_markdown_report(results, title=f'Compliance Report ({datetime.utcnow().isoformat()}Z)')
+    results = _audit(args)
+    md = generate_markdown_report(results, title=f'Compliance Report ({_utc_timestamp()})')
     out = args.out or 'compliance-report.md'
     with open(out, 'w', encoding='utf-8') as f:
         f.write(md)
@@ -37,31 +65,19 @@ def cmd_report(args):
 
 
 def cmd_certify(args):
-    repo = args.repo or os.getcwd()
-    checklist_dir = os.path.join(os.path.dirname(__file__), 'checklists')
-    checks = load_checklists(checklist_dir)
-    results = audit_repo(repo, checks)
-    md = generate_markdown_report(results, title=f'Certification Packet ({datetime.utcnow().isoformat()}Z)')
+    results = _audit(args)
+    md = generate_markdown_report(results, title=f'Certification Packet ({_utc_timestamp()})')
     out = args.out or 'certification-packet.zip'
-    # create zip: report + raw audit JSON
-    tmp_md = 'tmp_compliance_report.md'
-    tmp_json = 'tmp_audit.json'
-    with open(tmp_md, 'w', encoding='utf-8') as f:
-        f.write(md)
-    with open(tmp_json, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2)
-    with ZipFile(out, 'w') as z:
-        z.write(tmp_md)
-        z.write(tmp_json)
-    os.remove(tmp_md)
-    os.remove(tmp_json)
+    # create zip: report + raw audit JSON, written straight from memory
+    with ZipFile(out, 'w', ZIP_DEFLATED, compresslevel=6) as z:
+        z.writestr('compliance-report.md', md)
+        z.writestr('audit.json', _dumps(results))
     print(f'Wrote certification packet to {out}')
 
 
 def cmd_checklist(args):
-    checklist_dir = os.path.join(os.path.dirname(__file__), 'checklists')
-    checks = load_checklists(checklist_dir)
-    print(json.dumps(checks, indent=2))
+    checks = load_checklists(_CHECKLIST_DIR)
+    _print_json(checks)
 
 
 def main(argv=None):
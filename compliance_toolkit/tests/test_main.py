@@ -0,0 +1,109 @@
+import argparse
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from compliance_toolkit import main, utils
+
+
+def setUpModule():
+    # keep the checklist cache out of the real user cache dir
+    tmp = tempfile.TemporaryDirectory()
+    patcher = mock.patch.object(utils, '_CACHE_DIR', tmp.name)
+    patcher.start()
+    unittest.addModuleCleanup(patcher.stop)
+    unittest.addModuleCleanup(tmp.cleanup)
+
+
+def _run(argv):
+    out = io.TextIOWrapper(io.BytesIO(), encoding='ascii')
+    with mock.patch('sys.stdout', out):
+        main.main(argv)
+        out.flush()
+        return out.buffer.getvalue()
+
+
+class JsonOutputTests(unittest.TestCase):
+    doc = [{'id': 'gdpr-x', 'title': 'Identität ✓', 'keywords': ['ä'], 'n': None, 'l': [1, {}]}]
+
+    def test_fallback_writes_utf8_indented_json(self):
+        with mock.patch.object(main, 'orjson', None):
+            data = main._dumps(self.doc)
+        self.assertEqual(data, json.dumps(self.doc, indent=2, ensure_ascii=False).encode('utf-8'))
+        self.assertIn('Identität ✓'.encode('utf-8'), data)
+
+    @unittest.skipIf(main.orjson is None, 'orjson not installed')
+    def test_orjson_and_fallback_produce_identical_bytes(self):
+        fast = main._dumps(self.doc)
+        with mock.patch.object(main, 'orjson', None):
+            self.assertEqual(main._dumps(self.doc), fast)
+
+    def test_stdout_gets_raw_utf8_even_on_ascii_console(self):
+        with mock.patch.object(main, 'load_checklists', return_value=self.doc):
+            data = _run(['checklist'])
+        self.assertEqual(data, main._dumps(self.doc) + b'\n')
+
+    def test_checklist_prints_items_unchanged(self):
+        doc = [{'id': 'a', '_note': 'kept', 'keywords': ['RBAC']}]
+        with mock.patch.object(main, 'load_checklists', return_value=doc):
+            self.assertEqual(json.loads(_run(['checklist'])), doc)
+
+    def test_audit_writes_json_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'audit.json')
+            _run(['audit', '--repo', tmp, '--out', out])
+            with open(out, encoding='utf-8') as f:
+                results = json.load(f)
+        self.assertTrue(results)
+        self.assertFalse(any(r['present'] for r in results))
+
+
+
+class AuditTests(unittest.TestCase):
+    def test_defaults_to_cwd(self):
+        with tempfile.TemporaryDirectory() as repo:
+            with open(os.path.join(repo, 'a.txt'), 'w') as f:
+                f.write('rbac')
+            with mock.patch('os.getcwd', return_value=repo):
+                results = main._audit(argparse.Namespace(repo=None))
+        self.assertTrue(any(r['present'] for r in results))
+
+    def test_repeated_commands_see_repo_changes(self):
+        with tempfile.TemporaryDirectory() as repo:
+            out = os.path.join(repo, 'audit.json')
+            _run(['audit', '--repo', repo, '--out', out])
+            with open(out, encoding='utf-8') as f:
+                self.assertFalse(any(r['present'] for r in json.load(f)))
+            with open(os.path.join(repo, 'a.txt'), 'w') as f:
+                f.write('encryption rbac')
+            _run(['audit', '--repo', repo, '--out', out])
+            with open(out, encoding='utf-8') as f:
+                self.assertTrue(any(r['present'] for r in json.load(f)))
+
+
+class CertifyTests(unittest.TestCase):
+    def test_packet_is_built_in_memory_and_compressed(self):
+        with tempfile.TemporaryDirectory() as repo, tempfile.TemporaryDirectory() as cwd:
+            out = os.path.join(cwd, 'cert.zip')
+            prev = os.getcwd()
+            os.chdir(cwd)  # the old implementation left temp files here
+            try:
+                _run(['certify', '--repo', repo, '--out', out])
+            finally:
+                os.chdir(prev)
+            self.assertEqual(os.listdir(cwd), ['cert.zip'])
+            with zipfile.ZipFile(out) as z:
+                self.assertEqual(z.namelist(), ['compliance-report.md', 'audit.json'])
+                self.assertTrue(all(i.compress_type == zipfile.ZIP_DEFLATED for i in z.infolist()))
+                results = json.loads(z.read('audit.json'))
+                report = z.read('compliance-report.md').decode('utf-8')
+        self.assertTrue(report.startswith('# Certification Packet ('))
+        self.assertEqual(len(results), report.count('- Status: **'))
+
+
+if __name__ == '__main__':
+    unittest.main()
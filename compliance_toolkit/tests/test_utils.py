@@ -0,0 +1,212 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from compliance_toolkit import utils
+
+
+def _write(root, name, data):
+    path = os.path.join(root, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data if isinstance(data, bytes) else data.encode('utf-8'))
+    return path
+
+
+def _present(repo, *keyword_sets):
+    checks = [{'id': str(i), 'keywords': list(kws)} for i, kws in enumerate(keyword_sets)]
+    return [r['present'] for r in utils.audit_repo(repo, checks)]
+
+
+class ScanTests(unittest.TestCase):
+    """Keyword scanning; run with the stdlib matcher (and pyahocorasick below)."""
+
+    ahocorasick = None
+
+    def setUp(self):
+        patcher = mock.patch.object(utils, 'ahocorasick', self.ahocorasick)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.repo = os.path.join(tmp.name, 'repo')
+        os.makedirs(self.repo)
+
+    def test_matches_case_insensitively_across_files(self):
+        _write(self.repo, 'src/a.rs', '// enforce RBAC here')
+        _write(self.repo, 'docs/b.md', 'See the CHANGELOG')
+        self.assertEqual(
+            _present(self.repo, ['rbac'], ['changelog', 'nope'], ['missing']),
+            [True, True, False],
+        )
+
+    def test_scan_repo_for_keywords(self):
+        _write(self.repo, 'a.txt', 'TLS everywhere')
+        self.assertTrue(utils.scan_repo_for_keywords(self.repo, ['tls']))
+        self.assertFalse(utils.scan_repo_for_keywords(self.repo, ['kms']))
+        self.assertFalse(utils.scan_repo_for_keywords(os.path.join(self.repo, 'nope'), ['tls']))
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'symlinks not supported')
+    def test_follows_file_symlinks_but_not_directory_symlinks(self):
+        target = _write(self.root, 'outside/policy.md', 'TLS and rbac')
+        os.symlink(target, os.path.join(self.repo, 'SECURITY.md'))
+        _write(self.root, 'linked_dir/x.txt', 'kms')
+        os.symlink(os.path.join(self.root, 'linked_dir'), os.path.join(self.repo, 'vendor'))
+        self.assertEqual(_present(self.repo, ['tls'], ['rbac'], ['kms']), [True, True, False])
+
+    def test_empty_keyword_matches_any_readable_file(self):
+        _write(self.repo, 'a.txt', 'rbac')
+        self.assertTrue(utils.scan_repo_for_keywords(self.repo, ['']))
+        self.assertEqual(_present(self.repo, ['']), [True])
+        self.assertEqual(_present(self.repo, [''], ['rbac'], ['x', ''], ['zzz']), [True, True, True, False])
+
+    def test_item_without_keywords_is_absent(self):
+        _write(self.repo, 'a.txt', 'rbac')
+        self.assertEqual(_present(self.repo, [], ['rbac']), [False, True])
+        self.assertEqual(_present(self.repo, []), [False])
+
+    def test_non_ascii_keyword_is_case_insensitive(self):
+        _write(self.repo, 'a.txt', 'Wir prüfen die IDENTITÄT')
+        self.assertEqual(_present(self.repo, ['identität'], ['IDENTITÄT'], ['äöü']), [True, True, False])
+
+    def test_keyword_across_mmap_window_boundary(self):
+        data = b'x' * (utils._WINDOW_SIZE - 5) + b'KEY Management' + b'y' * 1024
+        self.assertGreater(len(data), utils._MMAP_THRESHOLD)
+        _write(self.repo, 'big.log', data)
+        self.assertEqual(_present(self.repo, ['key management'], ['yx']), [True, False])
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'symlinks not supported')
+    def test_symlinked_large_file_is_mapped_by_target_size(self):
+        data = b'x' * (utils._WINDOW_SIZE - 3) + b'Encryption' + b'y' * 1024
+        target = _write(self.root, 'outside/big.log', data)
+        os.symlink(target, os.path.join(self.repo, 'big.log'))
+        with mock.patch.object(utils.mmap, 'mmap', wraps=utils.mmap.mmap) as mapped:
+            self.assertEqual(_present(self.repo, ['encryption']), [True])
+        mapped.assert_called_once()
+
+    def test_skips_binary_extensions(self):
+        _write(self.repo, 'logo.PNG', 'rbac')
+        _write(self.repo, 'lib.so', 'rbac')
+        _write(self.repo, 'dist.tar.gz', 'rbac')
+        _write(self.repo, 'app.wasm', 'rbac')
+        _write(self.repo, 'a', 'kms')  # dotless name is not an extension
+        self.assertEqual(_present(self.repo, ['rbac'], ['kms']), [False, True])
+
+    def test_scans_files_of_any_size(self):
+        _write(self.repo, 'big.md', b'x' * (5 << 20) + b' Encryption at rest')
+        self.assertEqual(_present(self.repo, ['encryption at rest']), [True])
+
+
+@unittest.skipIf(utils.ahocorasick is None, 'pyahocorasick not installed')
+class AhoCorasickScanTests(ScanTests):
+    ahocorasick = utils.ahocorasick
+
+
+
+class IterFileBytesTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = tmp.name
+
+    def test_early_exit_cancels_pending_reads(self):
+        for i in range(40):
+            _write(self.repo, f'f{i}.txt', 'data')
+        calls = []
+        lock = threading.Lock()
+
+        def slow_read(path):
+            with lock:
+                calls.append(path)
+            time.sleep(0.02)
+            return b'data'
+
+        with mock.patch.object(utils, '_read_lower', slow_read), \
+                mock.patch.object(utils, '_READ_WORKERS', 1), \
+                mock.patch.object(utils, '_MAX_PENDING_READS', 2):
+            it = utils._iter_file_bytes(self.repo)
+            self.assertEqual(next(it), b'data')
+            it.close()
+        self.assertLess(len(calls), 5)
+
+    def test_yields_every_file_once(self):
+        for i in range(10):
+            _write(self.repo, f'd{i % 3}/f{i}.txt', f'File{i}')
+        got = sorted(utils._iter_file_bytes(self.repo))
+        self.assertEqual(got, sorted(f'file{i}'.encode() for i in range(10)))
+
+
+
+class LoadChecklistsTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = os.path.join(tmp.name, 'checklists')
+        os.makedirs(self.dir)
+        self.cache = os.path.join(tmp.name, 'cache')
+        patcher = mock.patch.object(utils, '_CACHE_DIR', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write_checklist(self, items, mtime_ns, name='c.json'):
+        path = _write(self.dir, name, json.dumps(items))
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_cache_is_invalidated_on_change_and_pruned(self):
+        self._write_checklist([{'id': 'a', 'keywords': ['RBAC']}], 10**18)
+        first = utils.load_checklists(self.dir)
+        self.assertEqual([c['id'] for c in first], ['a'])
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+        with mock.patch.object(utils.json, 'load', side_effect=AssertionError('cache not used')):
+            self.assertEqual(utils.load_checklists(self.dir), first)
+
+        self._write_checklist([{'id': 'b', 'keywords': ['KMS']}], 10**18 + 10**9)
+        self.assertEqual([c['id'] for c in utils.load_checklists(self.dir)], ['b'])
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+
+    def test_other_checklist_dirs_keep_their_cache(self):
+        self._write_checklist([{'id': 'a'}], 10**18)
+        other = os.path.join(os.path.dirname(self.dir), 'other')
+        _write(other, 'c.json', json.dumps([{'id': 'z'}]))
+        utils.load_checklists(self.dir)
+        utils.load_checklists(other)
+        self.assertEqual(len(os.listdir(self.cache)), 2)
+
+    def test_returned_items_are_independent(self):
+        self._write_checklist([{'id': 'a', 'keywords': []}], 10**18)
+        utils.load_checklists(self.dir)[0]['id'] = 'changed'
+        self.assertEqual(utils.load_checklists(self.dir)[0]['id'], 'a')
+
+    def test_works_without_writable_cache(self):
+        self._write_checklist([{'id': 'a', 'keywords': []}], 10**18)
+        _write(os.path.dirname(self.cache), 'cache', 'not a dir')
+        self.assertEqual([c['id'] for c in utils.load_checklists(self.dir)], ['a'])
+
+    def test_keywords_are_prepared_once_and_kept_out_of_items(self):
+        self._write_checklist([{'id': 'a', '_note': 'mine', 'keywords': ['RBAC', 'Identität']}], 10**18)
+        for _ in range(2):  # fresh parse, then cache hit
+            checks, keyword_sets = utils._load_checklists(self.dir)
+            self.assertEqual(checks, [{'id': 'a', '_note': 'mine', 'keywords': ['RBAC', 'Identität']}])
+            self.assertEqual(keyword_sets, [(b'rbac', 'identität'.encode('utf-8'))])
+        self.assertEqual(utils.load_checklists(self.dir), checks)
+
+    def test_malformed_keywords_do_not_break_loading_or_audit(self):
+        self._write_checklist([{'id': 'a', 'keywords': None}, {'id': 'b', 'keywords': ['rbac', 3]}], 10**18)
+        self._write_checklist({'id': 'not-a-list'}, 10**18, name='d.json')
+        checks, keyword_sets = utils._load_checklists(self.dir)
+        self.assertEqual(len(checks), len(keyword_sets))
+        self.assertIn({'id': 'a', 'keywords': None}, checks)
+        self.assertIn((b'rbac',), keyword_sets)
+        items = [c for c in checks if isinstance(c, dict)]
+        _write(self.dir, 'repo/a.txt', 'RBAC')
+        present = [r['present'] for r in utils.audit_repo(os.path.join(self.dir, 'repo'), items)]
+        self.assertEqual(present, [False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,70 +1,337 @@
 import os
+import hashlib
 import json
-from typing import List, Dict, Any
+import mmap
+import pickle
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator; fall back to substring checks
+    ahocorasick = None
+
+# pyahocorasick is usually built for str keys; bytes are then mapped 1:1 onto
+# code points via latin-1 so matching still happens byte-for-byte.
+_AC_STR = ahocorasick is not None and bool(ahocorasick.unicode)
+
+# Binary and archive formats never worth scanning, matched on the lowercased
+# final extension.
+_SKIP_EXT = frozenset({
+    'png', 'jpg', 'jpeg', 'gif', 'bmp', 'ico', 'webp', 'svgz',
+    'pdf', 'zip', 'tar', 'gz', 'tgz', 'bz2', 'xz', 'zst', '7z', 'jar', 'whl',
+    'class', 'so', 'a', 'o', 'lib', 'dll', 'dylib', 'exe', 'bin', 'rlib', 'wasm', 'pyc',
+    'woff', 'woff2', 'ttf', 'otf', 'eot', 'mp3', 'mp4', 'mov',
+})
+
+# Files above this size (however large) are memory-mapped and scanned in
+# windows rather than read whole; below it the mmap setup costs more than a
+# plain read().
+_MMAP_THRESHOLD = 256 * 1024
+_WINDOW_SIZE = 1 << 20
+
+_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'compliance_toolkit',
+)
+# Bump when the shape of the pickled cache entries changes.
+_CACHE_VERSION = 2
+
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_MAX_PENDING_READS = _READ_WORKERS * 4
+
+
+_Keywords = Tuple[bytes, ...]
+_Loaded = Tuple[List[Dict[str, Any]], List[_Keywords]]
+
+
+def _item_keywords(item: Any) -> _Keywords:
+    """Return an item's keywords lowercased and UTF-8 encoded; malformed entries have none."""
+    kws = item.get('keywords') if isinstance(item, dict) else None
+    if not isinstance(kws, (list, tuple)):
+        return ()
+    return tuple(k.lower().encode('utf-8') for k in kws if isinstance(k, str))
+
+
+def _read_cache(cache_path: str) -> Optional[_Loaded]:
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _write_cache(cache_path: str, prefix: str, loaded: _Loaded) -> None:
+    """Atomically write cache_path and drop older entries sharing its dir prefix."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        tmp = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(loaded, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+        stale = [n for n in os.listdir(_CACHE_DIR) if n.startswith(prefix + '-') and n.endswith('.pkl')]
+    except Exception:
+        return
+    for name in stale:
+        full = os.path.join(_CACHE_DIR, name)
+        if full != cache_path:
+            try:
+                os.remove(full)
+            except OSError:
+                pass
 
 
 def load_checklists(path: str) -> List[Dict[str, Any]]:
-    checklists = []
+    """Load every checklist JSON file in path.
+
+    Parsed results are pickled under the user cache dir, keyed by the files'
+    names, mtimes and sizes, so repeat CLI runs skip JSON parsing entirely.
+    Only the newest cache entry per checklist dir is kept.
+    """
+    return _load_checklists(path)[0]
+
+
+def _load_checklists(path: str) -> _Loaded:
+    """Like load_checklists, also returning each item's keywords as from _item_keywords."""
+    checklists: List[Dict[str, Any]] = []
+    keyword_sets: List[_Keywords] = []
     if not os.path.isdir(path):
-        return checklists
+        return checklists, keyword_sets
+    entries = []
     for fname in os.listdir(path):
         if not fname.endswith('.json'):
             continue
+        try:
+            st = os.stat(os.path.join(path, fname))
+        except OSError:
+            continue
+        entries.append((fname, st.st_mtime_ns, st.st_size))
+    prefix = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+    key = hashlib.sha1(repr((_CACHE_VERSION, entries)).encode('utf-8')).hexdigest()
+    cache_path = os.path.join(_CACHE_DIR, f'{prefix}-{key}.pkl')
+    cached = _read_cache(cache_path)
+    if cached is not None:
+        return cached
+    for fname, _, _ in entries:
         full = os.path.join(path, fname)
         try:
             with open(full, 'r', encoding='utf-8') as f:
                 items = json.load(f)
-                checklists.extend(items)
+            kws = [_item_keywords(it) for it in items]
         except Exception:
             continue
-    return checklists
+        checklists.extend(items)
+        keyword_sets.extend(kws)
+    _write_cache(cache_path, prefix, (checklists, keyword_sets))
+    return checklists, keyword_sets
+
+
+def _walk_files(path: str) -> Iterator[os.DirEntry]:
+    """Yield files under path (following file symlinks, not directory ones).
+
+    scandir reuses the d_type from readdir, so regular entries cost no extra stat.
+    """
+    stack = [path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.is_file():
+                    yield e
+
+
+def _read_lower(path: str) -> Optional[bytes]:
+    # Unbuffered: FileIO.readall sizes one read from fstat, and we skip the
+    # BufferedReader allocation and isatty probe of a buffered open.
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            return f.read().lower()
+    except OSError:
+        return None
+
+
+def _iter_mapped(path: str, overlap: int) -> Iterator[bytes]:
+    try:
+        with open(path, 'rb', buffering=0) as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for pos in range(0, len(mm), _WINDOW_SIZE):
+                yield mm[max(pos - overlap, 0):pos + _WINDOW_SIZE].lower()
+    except (OSError, ValueError):  # ValueError: file emptied since it was stat'ed
+        return
+
+
+def _iter_file_bytes(repo_path: str, overlap: int = 0) -> Iterator[bytes]:
+    """Yield the ASCII-lowercased raw bytes of each scannable file under repo_path.
+
+    Small files are read on a thread pool (the GIL is released during I/O) and
+    yielded in completion order, with a bounded number of reads in flight.
+    Large files are memory-mapped and yielded as windows that overlap by
+    ``overlap`` bytes, so a keyword spanning a window boundary is still seen
+    without ever holding a full copy of the file. Reads still pending when the
+    caller stops iterating are cancelled.
+    """
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+        try:
+            for e in _walk_files(repo_path):
+                _, dot, ext = e.name.rpartition('.')
+                if dot and ext.lower() in _SKIP_EXT:
+                    continue
+                try:
+                    size = e.stat().st_size
+                except OSError:
+                    continue
+                if size > _MMAP_THRESHOLD:
+                    yield from _iter_mapped(e.path, overlap)
+                    continue
+                pending.add(pool.submit(_read_lower, e.path))
+                if len(pending) < _MAX_PENDING_READS:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    data = fut.result()
+                    if data is not None:
+                        yield data
+            for fut in as_completed(pending):
+                data = fut.result()
+                if data is not None:
+                    yield data
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+
+def _max_keyword_len(keyword_sets: Iterable[_Keywords]) -> int:
+    return max((len(k) for kws in keyword_sets for k in kws), default=0)
+
+
+def _build_matcher(keyword_sets: Iterable[_Keywords]) -> Callable[[bytes, Set[int]], None]:
+    """Return a function adding to ``found`` the indices of the keyword sets hit in lowercased bytes.
+
+    Keywords must already be lowercased and encoded (see ``_item_keywords``).
+
+    All keywords are matched in a single pass with an Aho-Corasick automaton when
+    pyahocorasick is installed, otherwise with one substring check per keyword.
+    Either way the scan stops as soon as every keyword set has been found, and
+    keywords of sets already found are not searched again.
+    """
+    needles: Dict[bytes, Set[int]] = {}
+    for idx, kws in enumerate(keyword_sets):
+        for k in kws:
+            needles.setdefault(k, set()).add(idx)
+    total = len(set().union(*needles.values()))
+    # An empty keyword occurs in every buffer (as ``'' in data`` always did) and
+    # cannot be added to an automaton, so those sets match on any file.
+    always = frozenset(needles.pop(b'', ()))
+    # bytes.lower() only folds ASCII, so non-ASCII keywords are matched against
+    # the decoded, Unicode-lowered text instead of the raw bytes.
+    text_needles = {k.decode('utf-8'): needles.pop(k) for k in [k for k in needles if not k.isascii()]}
+
+    if ahocorasick is not None and needles:
+        automaton = ahocorasick.Automaton()
+        for k, ids in needles.items():
+            automaton.add_word(k.decode('latin-1') if _AC_STR else k, frozenset(ids))
+        automaton.make_automaton()
+
+        def match_bytes(data: bytes, found: Set[int]) -> None:
+            for _, ids in automaton.iter(data.decode('latin-1') if _AC_STR else data):
+                found |= ids
+                if len(found) == total:
+                    return
+    else:
+        def match_bytes(data: bytes, found: Set[int]) -> None:
+            for k, ids in needles.items():
+                if ids <= found or data.find(k) == -1:
+                    continue
+                found |= ids
+                if len(found) == total:
+                    return
+
+    def match_text(data: bytes, found: Set[int]) -> None:
+        pending = [(k, ids) for k, ids in text_needles.items() if not ids <= found]
+        if not pending:
+            return
+        text = data.decode('utf-8', errors='ignore').lower()
+        for k, ids in pending:
+            if k in text:
+                found |= ids
+
+    def match(data: bytes, found: Set[int]) -> None:
+        found |= always
+        if len(found) < total:
+            match_bytes(data, found)
+        if text_needles and len(found) < total:
+            match_text(data, found)
+    return match
 
 
 def scan_repo_for_keywords(repo_path: str, keywords: List[str]) -> bool:
     """Return True if any keyword appears in the repo files (simple heuristic)."""
-    low_kw = [k.lower() for k in keywords]
-    for root, _, files in os.walk(repo_path):
-        for fn in files:
-            if fn.endswith(('.png', '.jpg', '.jpeg', '.gif', '.class')):
-                continue
-            try:
-                p = os.path.join(root, fn)
-                with open(p, 'r', encoding='utf-8', errors='ignore') as f:
-                    data = f.read().lower()
-                    for k in low_kw:
-                        if k in data:
-                            return True
-            except Exception:
-                continue
+    kws = _item_keywords({'keywords': keywords})
+    match = _build_matcher([kws])
+    overlap = max(_max_keyword_len([kws]) - 1, 0)
+    found: Set[int] = set()
+    for data in _iter_file_bytes(repo_path, overlap):
+        match(data, found)
+        if found:
+            return True
     return False
 
 
 def audit_repo(repo_path: str, checklists: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return _audit_repo(repo_path, checklists, [_item_keywords(item) for item in checklists])
+
+
+def _audit_repo(
+    repo_path: str, checklists: List[Dict[str, Any]], keyword_sets: List[_Keywords],
+) -> List[Dict[str, Any]]:
+    """audit_repo with each item's keywords already prepared (e.g. by _load_checklists)."""
+    match = _build_matcher(keyword_sets)
+    overlap = max(_max_keyword_len(keyword_sets) - 1, 0)
+    # Walk and read the tree once for all items; stop early once every item
+    # that can match (i.e. has keywords) has been found.
+    wanted = {idx for idx, kws in enumerate(keyword_sets) if kws}
+    found: Set[int] = set()
+    if wanted:
+        for data in _iter_file_bytes(repo_path, overlap):
+            match(data, found)
+            if found >= wanted:
+                break
     results = []
-    for item in checklists:
-        present = scan_repo_for_keywords(repo_path, item.get('keywords', []))
+    for idx, item in enumerate(checklists):
         results.append({
             'id': item.get('id'),
             'title': item.get('title'),
             'description': item.get('description'),
-            'present': present,
+            'present': idx in found,
             'remediation': item.get('remediation'),
         })
     return results
 
 
 def generate_markdown_report(results: List[Dict[str, Any]], title: str = 'Compliance Report') -> str:
-    lines = [f'# {title}', '']
     passed = sum(1 for r in results if r['present'])
-    lines.append(f'- Total checks: {len(results)}')
-    lines.append(f'- Checks detected (heuristic pass): {passed}')
-    lines.append('')
+    lines = [
+        f'# {title}',
+        '',
+        f'- Total checks: {len(results)}',
+        f'- Checks detected (heuristic pass): {passed}',
+        '',
+    ]
+    extend = lines.extend
     for r in results:
-        status = 'PASS' if r['present'] else 'FAIL'
-        lines.append(f'## {r["id"]} - {r["title"]}  ')
-        lines.append(f'- Status: **{status}**')
-        lines.append(f'- Description: {r.get("description","")}')
-        if not r['present']:
-            lines.append(f'- Remediation: {r.get("remediation","")}')
+        get = r.get
+        present = r['present']
+        extend((
+            f'## {r["id"]} - {r["title"]}  ',
+            f'- Status: **{"PASS" if present else "FAIL"}**',
+            f'- Description: {get("description", "")}',
+        ))
+        if not present:
+            lines.append(f'- Remediation: {get("remediation", "")}')
         lines.append('')
     return '\n'.join(lines)